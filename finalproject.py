@@ -1,9 +1,18 @@
+from collections import defaultdict
+
+import numpy as np
 import pandas as pd
 
 #Load and clean the IMDB movie data
 def load_movie_data(file_path):
     try:
-        df = pd.read_csv(file_path)
+        # Only load the columns the recommender uses, with narrow numeric types
+        # (nullable for now, so rows with missing values can be dropped below)
+        df = pd.read_csv(
+            file_path,
+            usecols=['Title', 'Genre', 'Year', 'Rating', 'Runtime (Minutes)', 'Votes', 'Actors'],
+            dtype={'Year': 'Int16', 'Runtime (Minutes)': 'Int16', 'Votes': 'Int32'}
+        )
     except FileNotFoundError: #make sure that the necessary dataset exists
         print("❌ File not found. Check the file path.")
         return None
@@ -11,28 +20,67 @@ def load_movie_data(file_path):
     # Normalize Genre field: make sure each genre is separately searchable
     df['Genre'] = df['Genre'].fillna('').apply(lambda g: [genre.strip() for genre in g.split(',')])
 
+    # Lowercase actor names once so case-insensitive actor searches don't redo it every time
+    df['_actors_lower'] = df['Actors'].fillna('').str.lower()
+
     # Drop rows with missing important data
     df = df.dropna(subset=['Rating', 'Year', 'Runtime (Minutes)', 'Genre'])
 
-    return df
+    # Now that those columns have no gaps, store them as plain numpy types. Year becomes an
+    # ordered categorical: the dataset only spans a handful of years, so year filters can
+    # compare small integer codes instead of full integers
+    df = df.astype({
+        'Year': pd.CategoricalDtype(sorted(df['Year'].unique()), ordered=True),
+        'Runtime (Minutes)': 'int16'
+    })
+
+    # Precompute a boolean mask per genre so filtering doesn't scan every row's genre list
+    genre_masks = {}
+    for i, genre_list in enumerate(df['Genre']):
+        for genre in genre_list:
+            if genre:  # Skip the empty entry left by a missing Genre
+                if genre not in genre_masks:
+                    genre_masks[genre] = np.zeros(len(df), dtype=bool)
+                genre_masks[genre][i] = True
+
+    return df, genre_masks
 
 #Load the Oscar dataset from a CSV
 def load_oscar_data(file_path):
     try:
-        oscar_df = pd.read_csv(file_path)
+        oscar_df = pd.read_csv(file_path, usecols=['film', 'category', 'winner'])
     except FileNotFoundError: #same check as last time
         print("❌ Oscar data file not found.")
         return None
 
     # Clean the Oscar dataset (strip extra spaces)
     oscar_df['film'] = oscar_df['film'].str.strip()
-    return oscar_df
+    # Normalize winner status to booleans once instead of on every lookup
+    oscar_df['winner'] = oscar_df['winner'].astype(str).str.strip().str.lower().eq('true')
+
+    # Index nominations by lowercase film title so lookups don't scan the whole dataset
+    oscar_index = defaultdict(list)
+    nominated = oscar_df.dropna(subset=['film'])
+    for film, category, winner in zip(nominated['film'].str.lower().to_numpy(),
+                                      nominated['category'].to_numpy(), nominated['winner'].to_numpy()):
+        oscar_index[film].append((category, winner))
+    oscar_index = dict(oscar_index)
+
+    # Map every 3-letter chunk to the films containing it, so substring searches only check likely films.
+    # Each entry is a dict used as an ordered set, so films stay in dataset order
+    oscar_trigrams = defaultdict(dict)
+    for film in oscar_index:
+        for i in range(len(film) - 2):
+            oscar_trigrams[film[i:i + 3]][film] = None
+    oscar_trigrams = dict(oscar_trigrams)
+
+    return oscar_index, oscar_trigrams
 
 #Prompt user for movie preferences
-def get_user_preferences(df):
+def get_user_preferences(genre_masks):
 
-    # Get unique list of genres from all movies
-    all_genres = sorted(set(genre for genre_list in df['Genre'] for genre in genre_list))
+    # Get unique genres from all movies: the mask dict is used for checking input, a sorted list for display
+    all_genres = sorted(genre_masks)
 
     # Get user preference for genre (and make sure they input a genre existing in dataset)
     while True:
@@ -40,7 +88,7 @@ def get_user_preferences(df):
         if genre == "":
             genre = None  # user skipped
             break
-        elif genre in all_genres:
+        elif genre in genre_masks:
             break
         else: # user input an invalid genre
             while True:
@@ -111,37 +159,48 @@ def get_user_preferences(df):
         "fav_actor": fav_actor
     }
 
-def filter_movies(df, prefs):
-    # Start with a mask that includes everything
-    mask = pd.Series([True] * len(df))
-
-    # Apply filters only if preferences are provided
+def filter_movies(df, genre_masks, prefs):
+    # Compare only the columns for preferences that were provided, then combine the results
+    conditions = []
     if prefs['genre']:
-        mask &= df['Genre'].apply(lambda genres: prefs['genre'] in genres)
+        conditions.append(genre_masks[prefs['genre']])
     if prefs['min_rating'] is not None:
-        mask &= df['Rating'] >= prefs['min_rating']
-    if prefs['min_year'] is not None:
-        mask &= df['Year'] >= prefs['min_year']
-    if prefs['max_year'] is not None:
-        mask &= df['Year'] <= prefs['max_year']
+        conditions.append(df['Rating'].to_numpy() >= prefs['min_rating'])
+    if prefs['min_year'] is not None or prefs['max_year'] is not None:
+        # Translate the year bounds into category codes and compare those
+        years = df['Year'].cat.categories
+        year_codes = df['Year'].cat.codes.to_numpy()
+        if prefs['min_year'] is not None:
+            conditions.append(year_codes >= years.searchsorted(prefs['min_year']))
+        if prefs['max_year'] is not None:
+            conditions.append(year_codes <= years.searchsorted(prefs['max_year'], side='right') - 1)
     if prefs['max_runtime'] is not None:
-        mask &= df['Runtime (Minutes)'] <= prefs['max_runtime']
-
-    filtered_df = df[mask].copy()
+        conditions.append(df['Runtime (Minutes)'].to_numpy() <= prefs['max_runtime'])
+
+    # A single active filter is used as-is; otherwise the conditions are ANDed into a fresh array,
+    # so the shared genre masks are never modified
+    mask = None
+    if len(conditions) == 1:
+        mask = conditions[0]
+    elif conditions:
+        mask = conditions[0] & conditions[1]
+        for condition in conditions[2:]:
+            mask &= condition
+    # No copy needed here: both branches below build a new frame when sorting
+    filtered_df = df if mask is None else df.loc[mask]
 
     if prefs.get('fav_actor'):
         # Create boolean mask where actor is found in the movie
-        actor_mask = filtered_df['Actors'].str.contains(prefs['fav_actor'], case=False, na=False)
+        actor_mask = filtered_df['_actors_lower'].str.contains(prefs['fav_actor'].lower(), na=False, regex=False)
 
         if not actor_mask.any():
             print(f"👀 No matches found with actor '{prefs['fav_actor']}' in the filtered results.")
 
         # Sort: actor matches to top, then by rating and votes
+        filtered_df = filtered_df.assign(_actor_hit=actor_mask.to_numpy().view(np.int8))
         sorted_df = filtered_df.sort_values(
-            by=['Actors', 'Rating', 'Votes'],
-            ascending=[False, False, False],
-            key=lambda col: actor_mask if col.name == 'Actors' else col
-        )
+            by=['_actor_hit', 'Rating', 'Votes'], ascending=False
+        ).drop(columns='_actor_hit')
     else:
         # Default sort: by IMDb rating and vote count
         sorted_df = filtered_df.sort_values(by=['Rating', 'Votes'], ascending=False)
@@ -149,25 +208,42 @@ def filter_movies(df, prefs):
     return sorted_df
 
 
-def check_oscar_status(movie_title, oscar_df):
+def check_oscar_status(movie_title, oscar_index, oscar_trigrams):
     """Check if a movie has been nominated or won an Oscar, and for which category."""
-    if oscar_df is not None:
-        # Check if movie is in the Oscar dataset and has a winner status
-        matched_rows = oscar_df[oscar_df['film'].str.contains(movie_title, case=False, na=False)]
-
-        if not matched_rows.empty:
-            oscar_info = []
-            for _, row in matched_rows.iterrows():
-                category = row['category']  # category from the dataset
-                winner = row['winner']
-                status = "Winner" if str(winner).strip().lower() == 'true' else "Nominated"
-                oscar_info.append(f"{status} for {category}")
-
-            return oscar_info  # Return a list of Oscar categories and statuses
+    title = movie_title.lower()
+
+    # Look for an exact title match first, then fall back to films whose title contains it
+    matches = oscar_index.get(title)
+    if matches is None:
+        # Titles shorter than 3 characters have no chunks to prefilter on, so every film is checked
+        candidates = oscar_index
+        if len(title) >= 3:
+            # A film can only contain the title if it contains every 3-letter chunk of it,
+            # so intersect the films listed under each chunk, starting from the rarest
+            film_sets = []
+            for i in range(len(title) - 2):
+                films = oscar_trigrams.get(title[i:i + 3])
+                if not films:
+                    film_sets = []  # Most titles have no Oscar record and stop here
+                    break
+                film_sets.append(films)
+            candidates = []
+            if film_sets:
+                film_sets.sort(key=len)
+                candidates = [film for film in film_sets[0] if all(film in films for films in film_sets[1:])]
+        matches = [match for film in candidates if title in film for match in oscar_index[film]]
+
+    if matches:
+        oscar_info = []
+        for category, winner in matches:
+            status = "Winner" if winner else "Nominated"
+            oscar_info.append(f"{status} for {category}")
+
+        return oscar_info  # Return a list of Oscar categories and statuses
     return None
 
 
-def show_recommendations(recommendations, oscar_df, fav_actor=None):
+def show_recommendations(recommendations, oscar_index, oscar_trigrams, fav_actor=None):
     """Print top movie recommendations, allowing user to swap out ones they've already seen"""
 
     # Let user know if no matches found
@@ -175,29 +251,38 @@ def show_recommendations(recommendations, oscar_df, fav_actor=None):
         print("\n😔 Sorry, no movies matched your criteria.")
         return
 
-    top_matches = recommendations[['Title', 'Genre', 'Year', 'Rating', 'Runtime (Minutes)', 'Actors']].reset_index(
-        drop=True)
+    top_matches = recommendations[['Title', 'Genre', 'Year', 'Rating', 'Runtime (Minutes)', 'Actors',
+                                   '_actors_lower']].reset_index(drop=True)
 
     display_limit = min(5, len(top_matches))  # Handle fewer than 5 matches
     display_indices = list(range(display_limit))
     next_index = display_limit
+    fav_actor_lower = fav_actor.lower() if fav_actor else None
+    formatted = {}  # Cache of each movie's display line, keyed by its index in top_matches
 
-    while True:
-        print("\n🎥 Top Movie Recommendations:")
-        for i, idx in enumerate(display_indices):
-            movie = top_matches.iloc[idx]
-            oscar_info = check_oscar_status(movie['Title'], oscar_df)  # Oscar info
-            oscar_note = ""
-            if oscar_info:
-                oscar_note = " | " + ", ".join(oscar_info)  # Join all Oscar nominations/wins
-            actor_note = ""
-            if fav_actor and fav_actor.lower() in movie['Actors'].lower():
-                actor_note = f" (features {fav_actor})"
-            print(
-                f"{i + 1}. {movie['Title']} ({int(movie['Year'])}) | {movie['Genre']} | "
-                f"{movie['Rating']}⭐ | {int(movie['Runtime (Minutes)'])} min{oscar_note}{actor_note}"
-            )
+    dirty = True  # Whether the list changed and needs to be printed again
 
+    while True:
+        if dirty:
+            print("\n🎥 Top Movie Recommendations:")
+            for i, idx in enumerate(display_indices):
+                # Only format movies that haven't been shown yet; swapped-in movies get formatted here
+                if idx not in formatted:
+                    movie = top_matches.iloc[idx]
+                    oscar_info = check_oscar_status(movie['Title'], oscar_index, oscar_trigrams)  # Oscar info
+                    oscar_note = ""
+                    if oscar_info:
+                        oscar_note = " | " + ", ".join(oscar_info)  # Join all Oscar nominations/wins
+                    actor_note = ""
+                    if fav_actor_lower and fav_actor_lower in movie['_actors_lower']:
+                        actor_note = f" (features {fav_actor})"
+                    formatted[idx] = (
+                        f"{movie['Title']} ({int(movie['Year'])}) | {movie['Genre']} | "
+                        f"{movie['Rating']}⭐ | {int(movie['Runtime (Minutes)'])} min{oscar_note}{actor_note}"
+                    )
+                print(f"{i + 1}. {formatted[idx]}")
+
+        dirty = False
         seen_input = input("\nHave you already seen any of these? (y/n): ").strip().lower()
 
         if seen_input == 'n':
@@ -223,6 +308,7 @@ def show_recommendations(recommendations, oscar_df, fav_actor=None):
                     if next_index < len(top_matches):
                         display_indices[seen_idx] = next_index
                         next_index += 1
+                        dirty = True
                     else:
                         print(f"⚠️ No more new recommendations to replace movie #{seen_idx + 1}.")
 
@@ -238,17 +324,19 @@ def main():
     movie_file_path = 'IMDB-Movie-Data.csv'  # Path to your movie details dataset
     oscar_file_path = 'oscar_data.csv'  # Path to your Oscar dataset
 
-    movie_df = load_movie_data(movie_file_path)
-    oscar_df = load_oscar_data(oscar_file_path)
+    movie_data = load_movie_data(movie_file_path)
+    oscar_data = load_oscar_data(oscar_file_path)
 
     # Start project with instructions
     print('Welcome to movie recommender! 🎬✨\n')
     print("First, you'll go through a quick survey about your preferences. Feel free to click 'Enter' to skip\n")
 
-    if movie_df is not None and oscar_df is not None:
-        prefs = get_user_preferences(movie_df)
-        recommendations = filter_movies(movie_df, prefs)
-        show_recommendations(recommendations, oscar_df, prefs.get('fav_actor'))
+    if movie_data is not None and oscar_data is not None:
+        movie_df, genre_masks = movie_data
+        oscar_index, oscar_trigrams = oscar_data
+        prefs = get_user_preferences(genre_masks)
+        recommendations = filter_movies(movie_df, genre_masks, prefs)
+        show_recommendations(recommendations, oscar_index, oscar_trigrams, prefs.get('fav_actor'))
 
 
 if __name__ == '__main__':